@@ -9,11 +9,28 @@ MULTI-SITE ARCHITECTURE:
   - Kit Manager (localhost:3020) - Main kits frontend
   - Auth Server (localhost:3012) - Auth service
 
+MULTI-INSTANCE:
+  Ports are allocated per launcher instance. The base ports above are used
+  when free, otherwise the next free port is picked. Allocations are kept in
+  a shared, file-locked registry (see PORT_REGISTRY_FILE) so several
+  launchers can run side by side without killing each other's servers.
+
+SCALE TESTING:
+  python dev_server.py --seed-scale [--seed-rows=N] [--seed-out=DIR] ...
+  Streams synthetic analytics rows (see SEED_DEFAULTS) and exits.
+  All tables load in one transaction - a failure leaves the database untouched.
+  Runs use a random seed (printed); repeat one with --seed-random-seed=N.
+  Runs append, so data can be grown step by step; --seed-truncate=1 empties
+  the seeded tables first.
+
 KEYBOARD COMMANDS:
   - [R] Full reboot with Prisma sync
   - [F] Fast reboot (skip Prisma)
   - [P] Open Prisma Studio
   - [D] Check database connection
+  - [T] Compile timing report
+  - [S] Prisma slow-query report (start with --query-log)
+  - [L] Search recent server output (--log-filter=QUERY sets the default)
   - [Q] Quit
 """
 
@@ -25,42 +42,165 @@ import socket
 import time
 import shutil
 import threading
+import queue
 import re
 import webbrowser
-from datetime import datetime
+import json
+import tempfile
+import random
+import bisect
+import uuid
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 
 # Global flags
 reboot_requested = False
 quit_requested = False
 quick_mode = False  # Skip prisma steps for faster startup
 prisma_studio_process = None  # Track Prisma Studio process
+instance_slot = 0  # Launcher instance number (0 = primary), assigned by the port registry
 
 # Configuration for multiple sites
 SITES = {
     'kits': {
         'name': 'Icefuse Kit Manager',
-        'port': 3020,
+        'base_port': 3020,
+        'port': 3020,  # Actual port, assigned by allocate_ports()
         'dir': os.path.dirname(os.path.abspath(__file__)),
         'color': '\033[96m',  # Cyan
         'enabled': True,
+        'runtime': {},  # Fixed overrides for heap_mb / threadpool / workers (see compute_runtime_tuning)
+        # Env vars pointing at other sites' allocated URLs (env var -> site key)
+        'links': {
+            'AUTH_URL': 'auth',
+            'NEXT_PUBLIC_AUTH_URL': 'auth',
+            'NEXTAUTH_URL': 'kits',
+        },
     },
     'auth': {
         'name': 'Auth Server v2',
+        'base_port': 3012,
         'port': 3012,
         'dir': r'C:\Users\Corvezeo\Desktop\Github\ifn_app_auth_v2',
         'color': '\033[95m',  # Magenta
         'enabled': True,
+        'runtime': {},
+        'links': {
+            'AUTH_URL': 'auth',
+            'NEXTAUTH_URL': 'auth',
+        },
     }
 }
 
 PROJECT_DIR = SITES['kits']['dir']
 LOG_FILE = os.path.join(PROJECT_DIR, "dev_server.log")
 
-# Node.js paths (Windows)
-NODE_PATH = r"C:\Program Files\nodejs"
-NODE_EXE = os.path.join(NODE_PATH, "node.exe")
-NPM_CMD = os.path.join(NODE_PATH, "npm.cmd")
-NPX_CMD = os.path.join(NODE_PATH, "npx.cmd")
+# Port allocation
+PRISMA_STUDIO_BASE_PORT = 5555
+PORT_SEARCH_RANGE = 100  # How far above the base port to look for a free one
+MAX_INSTANCES = 5  # tsconfig.json lists the .next-<slot> type dirs for slots 1-4
+NEXT_CONFIG_FILES = ['next.config.ts', 'next.config.mjs', 'next.config.js']
+PORT_REGISTRY_DIR = os.path.join(tempfile.gettempdir(), "ifn_dev_server")
+PORT_REGISTRY_FILE = os.path.join(PORT_REGISTRY_DIR, "ports.json")
+PORT_REGISTRY_LOCK = os.path.join(PORT_REGISTRY_DIR, "ports.lock")
+allocated_ports = {}  # site key (or 'studio') -> port owned by this instance
+
+# Node runtime tuning (see compute_runtime_tuning)
+RESERVED_SYSTEM_MB = 2048     # Left for the OS, editor and browser
+PRISMA_STUDIO_MB = 512        # Kept free so Prisma Studio can be opened without swapping
+HEAP_SHARE = 0.6              # Part of a site's memory budget given to the V8 heap (rest: SWC, workers, buffers)
+HEAP_MIN_MB = 1024
+HEAP_MAX_MB = 4096
+THREADPOOL_MIN = 4            # libuv default
+THREADPOOL_MAX = 16
+runtime_tuning = {}  # site key -> {'heap_mb', 'threadpool', 'workers'}
+
+# Synthetic analytics data (--seed-scale, see run_seed_scale)
+SEED_DEFAULTS = {
+    'rows': 1_000_000,            # Rows per table (stats tables stop at their natural grid size)
+    'tables': [],                 # Empty = all of SEED_TABLES
+    'out': '',                    # Directory for .copy files; empty = pipe into DATABASE_URL via psql
+    'servers': 20,
+    'players_per_server': 5000,
+    'kits': 40,
+    'kits_per_wipe': 15,
+    'wipes': 8,                   # Wipes per server over the seeded period (file output; DB runs use server_wipe)
+    'days': 90,
+    'skew': 1.1,                  # Zipf exponent for server/kit/player popularity
+    'chunk': 10_000,              # Rows held in memory per write
+    'random_seed': 0,             # 0 = pick a random seed (printed so the run can be repeated)
+    'truncate': False,            # Empty the seeded tables first (same transaction)
+    'allow_remote': False,
+}
+# Stats tables may already hold rows for the same unique keys - loaded via a
+# staging table with ON CONFLICT DO NOTHING instead of a direct COPY
+SEED_UPSERT_TABLES = {'kit_usage_hourly_stats', 'kit_usage_daily_stats'}
+SEED_KIT_NAMES = ['starter', 'vip', 'elite', 'builder', 'farmer', 'medic', 'raider', 'pvp', 'boom', 'daily',
+                  'weekly', 'hunter', 'miner', 'electrician', 'fisher', 'chef', 'armor', 'ammo', 'tools', 'legend']
+SEED_SERVER_REGIONS = ['us', 'eu', 'au', 'sa', 'as']
+SEED_NAME_PARTS = ['Frost', 'Raider', 'Wolf', 'Ghost', 'Sniper', 'Toxic', 'Rusty', 'Blaze', 'Shadow', 'Nomad']
+SEED_REDEMPTION_SOURCES = ['chat_command', 'auto_kit', 'api_call']
+SEED_KIT_FAILURES = ['cooldown', 'max_uses', 'no_permission', 'inventory_full']
+SEED_GAME_TYPES = ['coinflip', 'deathroll', 'diceduel']
+SEED_REDIRECT_REASONS = ['AFK_TIMEOUT', 'PLAYER_RETURN', 'MANUAL']
+SEED_REDIRECT_OUTCOMES = ['success', 'failed', 'timeout']
+SEED_RANKS = ['default', 'vip', 'vip+', 'elite', 'admin']
+SEED_CLAN_EVENTS = ['create', 'join', 'leave', 'kick', 'promote', 'demote', 'disband']
+SEED_HOUR_WEIGHTS = [6, 4, 3, 2, 2, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 14, 16, 18, 20, 20, 18, 14, 9]  # UTC
+# Compile analytics (parsed from Next dev output, see record_compile_event)
+COMPILE_LINE_RE = re.compile(
+    r'Compiled(?: (?P<route>/\S*))? in (?P<duration>[\d.]+)\s?(?P<unit>ms|s|min)(?: \((?P<modules>\d+) modules\))?'
+)
+COMPILE_WATCH_DIRS = ['src', 'packages', 'prisma']
+COMPILE_TREND_BUCKET_SECONDS = 300
+COMPILE_BULK_CHANGE_FILES = 25  # More changed files than this in one HMR event = checkout/codegen, not credited
+compile_stats = {'routes': {}, 'files': {}, 'trend': {}, 'last_event': {}, 'started': time.time()}
+compile_lock = threading.Lock()
+compile_scan_queue = queue.Queue(maxsize=16)  # (site key, since, duration ms) for the changed-file scanner
+compile_scan_thread = None
+
+# Prisma query instrumentation (--query-log, see record_query_event)
+QUERY_LINE_RE = re.compile(r'\[prisma:query\] (?P<duration>[\d.]+)ms (?P<sql>.*)$')
+REQUEST_LINE_RE = re.compile(r'\b(?P<method>GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS) (?P<path>/\S*) \d{3} in [\d.]+m?s')
+QUERY_N_PLUS_ONE_THRESHOLD = 10  # Same shape this many times in one request window
+QUERY_SAMPLE_LIMIT = 1000        # Durations kept per shape/model for p95
+QUERY_REPORT_FILE = os.path.join(PROJECT_DIR, "query_report.txt")
+QUERY_LOG_CLIENT_FILE = 'src/lib/db.ts'  # Prisma client that honours PRISMA_QUERY_LOG
+query_log_mode = False
+query_stats = {'shapes': {}, 'models': {}, 'n_plus_one': {}, 'windows': {}}
+query_table_models = {}  # site key -> {table: model}
+query_lock = threading.Lock()
+
+# Log ring buffers (see LogRingBuffer)
+LOG_BUFFER_LINES = 5000          # Lines kept per site (--log-buffer=N)
+LOG_LINE_MAX_BYTES = 1000        # Longer lines are truncated in the buffer
+LOG_TAIL_LINES = 50              # Lines printed by [L] / after a crash
+LOG_CRASH_WINDOW_SECONDS = 30    # Seconds before the last crash shown by 'crash'
+LOG_LEVELS = {'INFO': 1, 'WARN': 2, 'ERROR': 3}
+LOG_ERROR_RE = re.compile(r'⨯|\b(?:error|ERR!|exception|fatal|panic)\b|Unhandled', re.I)
+LOG_WARN_RE = re.compile(r'⚠|\bwarn(?:ing)?\b|deprecat', re.I)
+log_buffers = {}          # site key or 'launcher' -> LogRingBuffer
+log_filter = ''           # Default query for [L] and crash tails (--log-filter=...)
+last_crash = {}           # {'site', 'time'} of the most recent dead site server
+site_output_threads = {}  # site key -> output reader thread
+
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+# Node.js paths
+if sys.platform == "win32":
+    NODE_PATH = r"C:\Program Files\nodejs"
+    NODE_EXE = os.path.join(NODE_PATH, "node.exe")
+    NPM_CMD = os.path.join(NODE_PATH, "npm.cmd")
+    NPX_CMD = os.path.join(NODE_PATH, "npx.cmd")
+else:
+    NODE_PATH = os.path.dirname(shutil.which("node") or "/usr/bin/node")
+    NODE_EXE = shutil.which("node") or "node"
+    NPM_CMD = shutil.which("npm") or "npm"
+    NPX_CMD = shutil.which("npx") or "npx"
+
+# Windows needs the shell to resolve .cmd shims; elsewhere commands are run directly
+USE_SHELL = sys.platform == "win32"
 
 # Add Node to PATH if not already there
 if NODE_PATH not in os.environ.get('PATH', ''):
@@ -97,6 +237,7 @@ def log(message, level="INFO", console=True):
         safe_print(log_line)
     with open(LOG_FILE, "a", encoding="utf-8") as f:
         f.write(log_line + "\n")
+    buffer_log_line('launcher', message, LOG_LEVELS.get(level, LOG_LEVELS['INFO']))
 
 def log_output(output, prefix="", console=True):
     """Log subprocess output to both console and file"""
@@ -125,7 +266,7 @@ def run_command(cmd, cwd=None, description="", verbose=True, timeout=120, env=No
         result = subprocess.run(
             cmd,
             cwd=cwd,
-            shell=True,
+            shell=USE_SHELL,
             capture_output=True,
             text=True,
             encoding='utf-8',
@@ -159,7 +300,10 @@ def print_header():
   Started: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
   Sites:   {sites_info}
   Mode:    {mode_info} (pass --quick or -q to skip Prisma)
+  Tuning:  automatic (override with --tune=kits.heap_mb=2048)
+  Queries: {'logging to ' + QUERY_REPORT_FILE if query_log_mode else 'off (pass --query-log)'}
   Log:     {LOG_FILE}
+  Instance: #{instance_slot} (port registry: {PORT_REGISTRY_FILE})
 
 {Colors.BOLD}  Keyboard Commands (while servers are running):{Colors.RESET}
     {Colors.GREEN}[R]{Colors.RESET} Reboot      - Full restart with Prisma sync
@@ -167,16 +311,24 @@ def print_header():
     {Colors.CYAN}[O]{Colors.RESET} Open        - Open browser (main page)
     {Colors.CYAN}[P]{Colors.RESET} Prisma      - Open Prisma Studio
     {Colors.BLUE}[D]{Colors.RESET} Database    - Check database connection
+    {Colors.BLUE}[T]{Colors.RESET} Timings     - Compile report (slowest routes, recompiled files)
+    {Colors.BLUE}[S]{Colors.RESET} SQL         - Slow-query / N+1 report (needs --query-log)
+    {Colors.BLUE}[L]{Colors.RESET} Logs        - Search recent output (regex, site=, level=, crash)
+                       Linux/macOS: type 'l <query>' + Enter, or 'l' + Enter for a prompt
     {Colors.YELLOW}[Q]{Colors.RESET} Quit        - Stop servers and exit
     {Colors.RED}Ctrl+C{Colors.RESET}     - Force stop and exit
 
-    {Colors.CYAN}[1]{Colors.RESET} Toggle Icefuse Kit Manager (port 3020)
-    {Colors.MAGENTA}[2]{Colors.RESET} Toggle Auth Server (port 3012)
+    {Colors.CYAN}[1]{Colors.RESET} Toggle Icefuse Kit Manager (port {SITES['kits']['port']})
+    {Colors.MAGENTA}[2]{Colors.RESET} Toggle Auth Server (port {SITES['auth']['port']})
 {Colors.CYAN}============================================{Colors.RESET}
 """)
 
 def kill_all_node_processes():
-    """Kill all running node processes"""
+    """Kill all running node processes (skipped while other launcher instances are running)"""
+    others = count_other_instances()
+    if others:
+        log(f"Skipping node process cleanup - {others} other launcher instance(s) running")
+        return
     log("Killing all node processes...")
     if sys.platform == "win32":
         try:
@@ -223,22 +375,267 @@ def kill_port(port):
             log(f"Error checking port: {e}", "WARN")
     log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} Port {port} is free")
 
-def clean_next_cache(site_dir, site_name):
-    """Delete the .next folder to clear build cache"""
-    next_dir = os.path.join(site_dir, ".next")
-    if os.path.exists(next_dir):
-        log(f"Deleting .next folder for {site_name}...")
+@contextmanager
+def port_registry_lock():
+    """Hold an exclusive lock on the shared port registry"""
+    os.makedirs(PORT_REGISTRY_DIR, exist_ok=True)
+    with open(PORT_REGISTRY_LOCK, "a+") as lock_file:
+        if sys.platform == "win32":
+            import msvcrt
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def is_pid_alive(pid):
+    """Check whether a process with the given PID is still running"""
+    if sys.platform == "win32":
+        try:
+            result = subprocess.run(
+                f'tasklist /FI "PID eq {pid}" /NH',
+                shell=True, capture_output=True, text=True
+            )
+            return str(pid) in result.stdout
+        except Exception:
+            return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def read_port_registry():
+    """Read the port registry, dropping entries of launchers that are no longer running.
+
+    Must be called while holding port_registry_lock().
+    """
+    try:
+        with open(PORT_REGISTRY_FILE, "r", encoding="utf-8") as f:
+            registry = json.load(f)
+    except (FileNotFoundError, ValueError):
+        registry = {}
+    return {pid: entry for pid, entry in registry.items() if is_pid_alive(int(pid))}
+
+def write_port_registry(registry):
+    """Write the port registry. Must be called while holding port_registry_lock()."""
+    tmp_file = PORT_REGISTRY_FILE + f".{os.getpid()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(registry, f, indent=2)
+    os.replace(tmp_file, PORT_REGISTRY_FILE)
+
+def is_port_free(port):
+    """Check that nothing is listening on the port and that it can be bound"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(0.5)
+    try:
+        if sock.connect_ex(('127.0.0.1', port)) == 0:
+            return False
+    finally:
+        sock.close()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.bind(('0.0.0.0', port))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+def register_instance():
+    """Register this launcher in the port registry and claim the lowest free instance slot"""
+    global instance_slot
+    with port_registry_lock():
+        registry = read_port_registry()
+        used_slots = {entry.get('slot') for pid, entry in registry.items() if pid != str(os.getpid())}
+        instance_slot = 0
+        while instance_slot in used_slots:
+            instance_slot += 1
+        if instance_slot >= MAX_INSTANCES:
+            raise RuntimeError(f"{MAX_INSTANCES} launcher instances are already running")
+        registry[str(os.getpid())] = {
+            'slot': instance_slot,
+            'dir': PROJECT_DIR,
+            'started': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'ports': {},
+        }
+        write_port_registry(registry)
+    return instance_slot
+
+def allocate_ports():
+    """Pick a free port for every site (and Prisma Studio) and record them in the registry.
+
+    Ports this instance already owns are kept across reboots when still free.
+    Ports reserved by other running launchers are never touched.
+    """
+    wanted = {key: site['base_port'] for key, site in SITES.items()}
+    wanted['studio'] = PRISMA_STUDIO_BASE_PORT
+
+    with port_registry_lock():
+        registry = read_port_registry()
+        me = str(os.getpid())
+        reserved = set()
+        for pid, entry in registry.items():
+            if pid != me:
+                reserved.update(entry.get('ports', {}).values())
+
+        claimed = set()
+        for key, base_port in wanted.items():
+            previous = allocated_ports.get(key)
+            candidates = [previous] if previous else []
+            candidates += range(base_port, base_port + PORT_SEARCH_RANGE)
+            for port in candidates:
+                if port in reserved or port in claimed:
+                    continue
+                if is_port_free(port):
+                    allocated_ports[key] = port
+                    claimed.add(port)
+                    break
+            else:
+                raise RuntimeError(
+                    f"No free port for {key} in {base_port}-{base_port + PORT_SEARCH_RANGE - 1}"
+                )
+
+        entry = registry.setdefault(me, {'slot': instance_slot, 'dir': PROJECT_DIR})
+        entry['ports'] = dict(allocated_ports)
+        entry['dist_dirs'] = [get_site_dist_path(key) for key, site in SITES.items() if site['enabled']]
+        write_port_registry(registry)
+
+    for key, site in SITES.items():
+        site['port'] = allocated_ports[key]
+        if site['port'] != site['base_port']:
+            log(f"{site['name']}: port {site['base_port']} is taken, using {site['port']}")
+    return allocated_ports
+
+def release_ports():
+    """Remove this launcher from the port registry"""
+    try:
+        with port_registry_lock():
+            registry = read_port_registry()
+            registry.pop(str(os.getpid()), None)
+            write_port_registry(registry)
+    except Exception as e:
+        log(f"Could not release ports: {e}", "WARN")
+    allocated_ports.clear()
+
+def count_other_instances():
+    """Number of other launcher instances currently registered"""
+    try:
+        with port_registry_lock():
+            registry = read_port_registry()
+    except Exception:
+        return 0
+    return len([pid for pid in registry if pid != str(os.getpid())])
+
+def get_site_url(site_key):
+    """Local URL of a site - its allocated port, or the primary instance's for shared sites"""
+    if not SITES[site_key]['enabled'] and SITES[site_key].get('shared'):
+        port = get_primary_port(site_key)
+        return f"http://localhost:{port}" if port else None
+    return f"http://localhost:{SITES[site_key]['port']}"
+
+def get_primary_port(site_key):
+    """Port the primary (slot 0) launcher allocated for a site, or None"""
+    try:
+        with port_registry_lock():
+            registry = read_port_registry()
+    except Exception:
+        return None
+    for entry in registry.values():
+        if entry.get('slot') == 0:
+            return entry.get('ports', {}).get(site_key)
+    return None
+
+def site_next_config_reads(site_key, env_var):
+    """Whether the site's next.config reads an env var the launcher sets (NEXT_DIST_DIR, NEXT_CPUS)"""
+    for name in NEXT_CONFIG_FILES:
+        try:
+            with open(os.path.join(SITES[site_key]['dir'], name), 'r', encoding='utf-8') as f:
+                return env_var in f.read()
+        except OSError:
+            continue
+    return False
+
+def apply_shared_sites():
+    """On secondary instances, share the primary's server for sites without their own build dir.
+
+    A site whose next.config ignores NEXT_DIST_DIR would build into the same
+    .next as the primary instance, so it isn't started here; links to it
+    point at the primary's server instead.
+    """
+    if instance_slot == 0:
+        return
+    for site_key, site in SITES.items():
+        if site['enabled'] and not site_next_config_reads(site_key, 'NEXT_DIST_DIR'):
+            site['enabled'] = False
+            site['shared'] = True
+            port = get_primary_port(site_key)
+            where = f"the primary instance's server (:{port})" if port else "no server (primary instance not found)"
+            log_print(f"  {Colors.YELLOW}[SHARED]{Colors.RESET} {site['name']}: next.config does not read "
+                      f"NEXT_DIST_DIR - using {where}")
+
+def get_next_dist_dir():
+    """Next.js build dir for this instance (secondary instances get their own).
+
+    Next adds <distDir>/types to tsconfig.json when it isn't listed, so the
+    .next-<slot> entries up to MAX_INSTANCES are already in the tracked tsconfig.
+    """
+    return ".next" if instance_slot == 0 else f".next-{instance_slot}"
+
+def get_site_dist_dir(site_key):
+    """Build dir a site actually uses - sites ignoring NEXT_DIST_DIR always use .next"""
+    return get_next_dist_dir() if site_next_config_reads(site_key, 'NEXT_DIST_DIR') else ".next"
+
+def get_site_dist_path(site_key):
+    return os.path.normcase(os.path.abspath(os.path.join(SITES[site_key]['dir'], get_site_dist_dir(site_key))))
+
+def is_dist_dir_used_elsewhere(path):
+    """Whether another registered launcher runs a site from this build dir"""
+    try:
+        with port_registry_lock():
+            registry = read_port_registry()
+    except Exception:
+        return False
+    return any(path in entry.get('dist_dirs', []) for pid, entry in registry.items() if pid != str(os.getpid()))
+
+def clean_next_cache(site_key, site_dir, site_name):
+    """Delete this instance's .next folder to clear build cache"""
+    dist_dir = get_site_dist_dir(site_key)
+    next_dir = os.path.join(site_dir, dist_dir)
+    if is_dist_dir_used_elsewhere(get_site_dist_path(site_key)):
+        log_print(f"  {Colors.YELLOW}[SKIP]{Colors.RESET} Keeping {dist_dir} for {site_name} (another launcher instance uses it)")
+    elif os.path.exists(next_dir):
+        log(f"Deleting {dist_dir} folder for {site_name}...")
         try:
             shutil.rmtree(next_dir)
-            log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} Deleted .next cache for {site_name}")
+            log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} Deleted {dist_dir} cache for {site_name}")
         except Exception as e:
-            log_print(f"  {Colors.YELLOW}[WARN]{Colors.RESET} Could not delete .next folder: {e}")
+            log_print(f"  {Colors.YELLOW}[WARN]{Colors.RESET} Could not delete {dist_dir} folder: {e}")
     else:
-        log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} No .next folder for {site_name}")
+        log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} No {dist_dir} folder for {site_name}")
 
 def clean_prisma_client(site_dir, site_name):
     """Delete the .prisma client folder to prevent permission errors on regenerate"""
     prisma_client_dir = os.path.join(site_dir, "node_modules", ".prisma")
+    if count_other_instances():
+        log_print(f"  {Colors.YELLOW}[SKIP]{Colors.RESET} Keeping .prisma client for {site_name} (other launcher instances use it)")
+        return
     if os.path.exists(prisma_client_dir):
         log(f"Deleting .prisma client folder for {site_name}...")
         try:
@@ -254,10 +651,10 @@ def check_node():
     log("Checking Node.js...")
     try:
         node_version = subprocess.run(
-            [NODE_EXE, '-v'], capture_output=True, text=True, shell=True
+            [NODE_EXE, '-v'], capture_output=True, text=True, shell=USE_SHELL
         ).stdout.strip()
         npm_version = subprocess.run(
-            [NPM_CMD, '-v'], capture_output=True, text=True, shell=True
+            [NPM_CMD, '-v'], capture_output=True, text=True, shell=USE_SHELL
         ).stdout.strip()
         log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} Node.js: {node_version}")
         log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} NPM: {npm_version}")
@@ -316,16 +713,123 @@ def check_database_connection():
         log(f"Database connection check failed: {e}", "WARN")
         return False
 
-def get_site_env():
-    """Get environment variables for a site with dev performance optimizations"""
+def get_memory_info():
+    """Return (total_mb, available_mb) for this machine, or (None, None) if unknown"""
+    if sys.platform == "win32":
+        try:
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ('dwLength', ctypes.c_ulong),
+                    ('dwMemoryLoad', ctypes.c_ulong),
+                    ('ullTotalPhys', ctypes.c_ulonglong),
+                    ('ullAvailPhys', ctypes.c_ulonglong),
+                    ('ullTotalPageFile', ctypes.c_ulonglong),
+                    ('ullAvailPageFile', ctypes.c_ulonglong),
+                    ('ullTotalVirtual', ctypes.c_ulonglong),
+                    ('ullAvailVirtual', ctypes.c_ulonglong),
+                    ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+                ]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullTotalPhys // (1024 * 1024), status.ullAvailPhys // (1024 * 1024)
+        except Exception:
+            return None, None
+
+    try:
+        meminfo = {}
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                meminfo[key] = int(value.split()[0])  # kB
+        return meminfo['MemTotal'] // 1024, meminfo.get('MemAvailable', meminfo['MemFree']) // 1024
+    except Exception:
+        pass
+
+    try:
+        total = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+        return total, total // 2  # No cheap "available" figure - assume half is free
+    except (ValueError, OSError, AttributeError):
+        return None, None
+
+def compute_runtime_tuning():
+    """Size heap, libuv threadpool and Next worker count for each enabled site.
+
+    Available memory (minus a system and Prisma Studio reserve) is split evenly
+    between the enabled sites and CPUs are divided the same way. Values set in a
+    site's 'runtime' dict (or via --tune) take precedence. Sites whose
+    next.config doesn't read NEXT_CPUS get no worker count (None).
+    """
+    enabled = [k for k, v in SITES.items() if v['enabled']]
+    site_count = max(1, len(enabled))
+    cpus = os.cpu_count() or 1
+    total_mb, available_mb = get_memory_info()
+
+    if available_mb is None:
+        heap_budget_mb = None
+        heap_mb = HEAP_MAX_MB
+    else:
+        budget_mb = (available_mb - RESERVED_SYSTEM_MB - PRISMA_STUDIO_MB) / site_count
+        heap_budget_mb = max(0, int(budget_mb * HEAP_SHARE))
+        heap_mb = int(min(HEAP_MAX_MB, max(HEAP_MIN_MB, heap_budget_mb)))
+    cpus_per_site = max(1, cpus // site_count)
+    threadpool = min(THREADPOOL_MAX, max(THREADPOOL_MIN, cpus_per_site))
+    workers = max(1, cpus_per_site - 1)  # Leave a core for the dev server itself
+
+    runtime_tuning.clear()
+    for site_key in enabled:
+        tuning = {'heap_mb': heap_mb, 'threadpool': threadpool, 'workers': workers}
+        tuning.update(SITES[site_key].get('runtime', {}))
+        if not site_next_config_reads(site_key, 'NEXT_CPUS'):
+            tuning['workers'] = None
+        if heap_budget_mb is not None and tuning['heap_mb'] > heap_budget_mb:
+            # HEAP_MIN_MB (or an override) wins over the budget - the sites may swap
+            tuning['heap_budget_mb'] = heap_budget_mb
+            log_print(f"  {Colors.YELLOW}[WARN]{Colors.RESET} {SITES[site_key]['name']}: heap {tuning['heap_mb']} MB "
+                      f"exceeds its {heap_budget_mb} MB memory budget ({available_mb} MB available)")
+        runtime_tuning[site_key] = tuning
+    return runtime_tuning
+
+def parse_tune_args(argv):
+    """Apply --tune=<site>.<heap_mb|threadpool|workers>=<value> overrides to SITES"""
+    for arg in argv:
+        if not arg.startswith('--tune='):
+            continue
+        try:
+            target, value = arg[len('--tune='):].split('=', 1)
+            site_key, setting = target.split('.', 1)
+            if site_key not in SITES or setting not in ('heap_mb', 'threadpool', 'workers'):
+                raise ValueError
+            SITES[site_key].setdefault('runtime', {})[setting] = int(value)
+        except ValueError:
+            log_print(f"{Colors.YELLOW}  [WARN] Ignoring invalid {arg} (expected --tune=kits.heap_mb=2048){Colors.RESET}")
+
+def get_site_env(site_key=None):
+    """Get environment variables for a site with dev performance optimizations.
+
+    When site_key is given, the site's tuned heap, threadpool and worker
+    settings are applied. CLI tools (prisma) get Node's own defaults.
+    """
     env = os.environ.copy()
     env['NODE_ENV'] = 'development'
 
     # Performance optimizations for Next.js development
     env['NEXT_TELEMETRY_DISABLED'] = '1'  # Disable telemetry overhead
-    env['NODE_OPTIONS'] = '--max-old-space-size=4096'  # More memory for faster compilation
     env['NEXT_PRIVATE_LOCAL_WEBPACK_DEV'] = '1'  # Use local webpack for faster rebuilds
 
+    if query_log_mode and site_key and site_supports_query_log(site_key):
+        env['PRISMA_QUERY_LOG'] = '1'  # Read by the site's src/lib/db.ts
+
+    tuning = runtime_tuning.get(site_key)
+    if tuning:
+        env['NODE_OPTIONS'] = f"--max-old-space-size={tuning['heap_mb']}"
+        env['UV_THREADPOOL_SIZE'] = str(tuning['threadpool'])
+        if tuning['workers'] is not None:
+            env['NEXT_CPUS'] = str(tuning['workers'])  # Read by next.config.ts (experimental.cpus)
+
     return env
 
 def run_prisma_generate(site_dir, site_name):
@@ -359,6 +863,490 @@ def run_prisma_db_push(site_dir, site_name):
         log_print(f"  {Colors.YELLOW}[WARN]{Colors.RESET} Schema sync failed - run manually if needed")
         return False
 
+def parse_seed_args(argv):
+    """Read --seed-<option>=<value> flags into a copy of SEED_DEFAULTS"""
+    cfg = dict(SEED_DEFAULTS)
+    for arg in argv:
+        if not arg.startswith('--seed-') or '=' not in arg:
+            continue
+        key, value = arg[len('--seed-'):].split('=', 1)
+        key = key.replace('-', '_')
+        if key not in cfg:
+            log_print(f"{Colors.YELLOW}  [WARN] Unknown seed option: {arg}{Colors.RESET}")
+            continue
+        default = SEED_DEFAULTS[key]
+        try:
+            if key == 'tables':
+                cfg[key] = [t.strip() for t in value.split(',') if t.strip()]
+            elif isinstance(default, bool):
+                cfg[key] = value.lower() in ('1', 'true', 'yes')
+            elif isinstance(default, float):
+                cfg[key] = float(value)
+            elif isinstance(default, int):
+                cfg[key] = int(value)
+            else:
+                cfg[key] = value
+        except ValueError:
+            log_print(f"{Colors.YELLOW}  [WARN] Ignoring invalid {arg}{Colors.RESET}")
+    return cfg
+
+def copy_value(value):
+    """Format a value for PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+    return str(value)
+
+def zipf_cum_weights(n, skew):
+    """Cumulative Zipf weights for picking rank 0..n-1 (rank 0 is the most popular)"""
+    total = 0.0
+    cum = []
+    for rank in range(n):
+        total += 1.0 / (rank + 1) ** skew
+        cum.append(total)
+    return cum
+
+def seed_id(rng, prefix):
+    """Prefixed ID in the src/lib/id.ts format ({prefix}_{uuid})"""
+    return f"{prefix}_{uuid.UUID(int=rng.getrandbits(128), version=4)}"
+
+def psql_query(db_url, sql):
+    """Run a query through psql and return rows as lists of strings"""
+    try:
+        result = subprocess.run(
+            ['psql', db_url, '-At', '-F', '\t', '-c', sql],
+            capture_output=True, text=True, timeout=30, env=get_psql_env(db_url)
+        )
+    except Exception:
+        return []
+    if result.returncode != 0:
+        return []
+    return [line.split('\t') for line in result.stdout.splitlines() if line]
+
+def get_psql_env(db_url):
+    """Env for psql - Prisma's ?schema= parameter becomes a search_path option"""
+    env = os.environ.copy()
+    match = re.search(r'[?&]schema=([^&]+)', db_url)
+    if match:
+        env['PGOPTIONS'] = f"-c search_path={match.group(1)}"
+    return env
+
+def strip_prisma_params(db_url):
+    """Remove Prisma-only URL parameters that libpq rejects"""
+    base, _, query = db_url.partition('?')
+    params = [p for p in query.split('&') if p and not p.startswith(('schema=', 'connection_limit=', 'pool_timeout='))]
+    return base + ('?' + '&'.join(params) if params else '')
+
+def build_seed_world(cfg, db_url=None):
+    """Build the servers, wipes, kits and player pools rows are drawn from.
+
+    When seeding a database, each seeded server is an existing
+    (game server, server identifier) pair taken from server_wipe, with that
+    pair's own wipes, so foreign keys resolve and events land in the wipe
+    running at their timestamp. Otherwise (file output, or no wipes yet)
+    wipes are evenly spaced windows over the seeded period with NULL ids.
+    """
+    rng = random.Random(cfg['random_seed'])
+    end = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    start = end - timedelta(days=cfg['days'])
+    game_servers, ident_ids, server_wipes, kit_configs = [], {}, {}, []
+    if db_url:
+        game_servers = [int(r[0]) for r in psql_query(db_url, 'SELECT id FROM game_server ORDER BY id')]
+        ident_ids = {r[1]: r[0] for r in psql_query(db_url, 'SELECT id, hashed_id FROM server_identifier')}
+        rows = psql_query(db_url, "SELECT id, server_identifier, game_server_id, "
+                                  "to_char(wiped_at, 'YYYY-MM-DD HH24:MI:SS'), to_char(ended_at, 'YYYY-MM-DD HH24:MI:SS') "
+                                  "FROM server_wipe ORDER BY game_server_id, server_identifier, wiped_at")
+        for wipe_id, ident, game_server_id, wiped_at, ended_at in rows:
+            server_wipes.setdefault((int(game_server_id), ident), []).append({
+                'id': wipe_id,
+                'start': datetime.strptime(wiped_at, '%Y-%m-%d %H:%M:%S'),
+                'ended': datetime.strptime(ended_at, '%Y-%m-%d %H:%M:%S') if ended_at else None,
+            })
+        kit_configs = [r[0] for r in psql_query(db_url, 'SELECT id FROM kit_config ORDER BY id')]
+
+    span = (end - start) / max(1, cfg['wipes'])
+    synthetic_wipes = [{'id': None, 'start': start + span * w, 'ended': None} for w in range(cfg['wipes'])]
+    pairs = list(server_wipes)
+    servers = []
+    for i in range(cfg['servers']):
+        if pairs:
+            game_server_id, ident = pairs[i % len(pairs)]
+            wipes = server_wipes[(game_server_id, ident)]
+        else:
+            # No wipes to pair servers with identifiers - only a lone game server is unambiguous
+            game_server_id = game_servers[0] if len(game_servers) == 1 else None
+            ident = f"ifn-{SEED_SERVER_REGIONS[i % len(SEED_SERVER_REGIONS)]}-{i + 1}"
+            wipes = synthetic_wipes
+        servers.append({
+            'game_server_id': game_server_id,
+            'ident_id': ident_ids.get(ident),
+            'ident': ident,
+            'wipes': wipes,
+            'wipe_starts': [w['start'] for w in wipes],
+            'player_base': i * cfg['players_per_server'],
+        })
+
+    kits = []
+    for i in range(cfg['kits']):
+        kits.append({
+            'id': seed_id(rng, 'kit'),
+            'name': f"{SEED_KIT_NAMES[i % len(SEED_KIT_NAMES)]}{'' if i < len(SEED_KIT_NAMES) else i // len(SEED_KIT_NAMES) + 1}",
+            'config_id': kit_configs[i % len(kit_configs)] if kit_configs else None,
+            'cooldown': rng.choice([300, 900, 3600, 14400, 86400]),
+            'items': rng.randint(3, 30),
+        })
+
+    # Each wipe runs a rotating window of kits_per_wipe kits
+    per_wipe = min(cfg['kits_per_wipe'], len(kits))
+    wipe_kits = []
+    for w in range(max(1, cfg['wipes'])):
+        start = (w * max(1, per_wipe // 3)) % len(kits)
+        wipe_kits.append([kits[(start + i) % len(kits)] for i in range(per_wipe)])
+
+    return {
+        'servers': servers,
+        'kits': kits,
+        'wipe_kits': wipe_kits,
+        'server_cw': zipf_cum_weights(len(servers), cfg['skew']),
+        'kit_cw': zipf_cum_weights(per_wipe, cfg['skew']),
+        'player_cw': zipf_cum_weights(cfg['players_per_server'], cfg['skew']),
+        'end': end,
+    }
+
+def seed_steam_id(player_index):
+    return str(76561198000000000 + player_index)
+
+def seed_player_name(player_index):
+    return f"{SEED_NAME_PARTS[player_index % len(SEED_NAME_PARTS)]}{player_index % 9973}"
+
+def seed_timestamps(rng, world, cfg, count):
+    """Random timestamps over the last `days` days following a player-activity curve"""
+    hours = rng.choices(range(24), weights=SEED_HOUR_WEIGHTS, k=count)
+    result = []
+    end = world['end']
+    for hour in hours:
+        ts = end - timedelta(days=rng.randrange(cfg['days']))
+        ts = ts.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60),
+                        microsecond=rng.randrange(1000) * 1000)
+        if ts > end:
+            ts -= timedelta(days=1)  # Later today hasn't happened yet - same time yesterday is still in range
+        result.append(ts)
+    return result
+
+def seed_wipe_at(world, server, ts):
+    """(kit rotation index, wipe id) for the server's wipe running at `ts`.
+
+    Events before the first wipe or after an ended wipe get a NULL wipe id.
+    """
+    i = bisect.bisect_right(server['wipe_starts'], ts) - 1
+    if i < 0:
+        return 0, None
+    wipe = server['wipes'][i]
+    if wipe['ended'] is not None and ts >= wipe['ended']:
+        return i % len(world['wipe_kits']), None
+    return i % len(world['wipe_kits']), wipe['id']
+
+def seed_event_context(rng, world, cfg, count):
+    """Pick (server, player index, timestamp, (kit rotation, wipe id)) for a chunk of events"""
+    servers = world['servers']
+    server_idx = rng.choices(range(len(servers)), cum_weights=world['server_cw'], k=count)
+    player_rank = rng.choices(range(cfg['players_per_server']), cum_weights=world['player_cw'], k=count)
+    stamps = seed_timestamps(rng, world, cfg, count)
+    for s, p, ts in zip(server_idx, player_rank, stamps):
+        server = servers[s]
+        yield server, server['player_base'] + p, ts, seed_wipe_at(world, server, ts)
+
+def gen_kit_usage_events(rng, world, cfg, limit):
+    chunk = cfg['chunk']
+    produced = 0
+    while produced < limit:
+        count = min(chunk, limit - produced)
+        kit_rank = rng.choices(range(len(world['kit_cw'])), cum_weights=world['kit_cw'], k=count)
+        for (server, player, ts, (rotation, wipe_id)), rank in zip(seed_event_context(rng, world, cfg, count), kit_rank):
+            kit = world['wipe_kits'][rotation][rank]
+            ok = rng.random() > 0.04
+            yield (
+                seed_id(rng, 'kitusage'), uuid.UUID(int=rng.getrandbits(128)).hex, kit['id'], kit['name'],
+                kit['config_id'], server['game_server_id'], server['ident'], server['ident_id'],
+                wipe_id, seed_steam_id(player), seed_player_name(player),
+                2 if player % 500 == 0 else 0,
+                rng.choices(SEED_REDEMPTION_SOURCES, weights=(70, 25, 5))[0], ok,
+                None if ok else rng.choice(SEED_KIT_FAILURES),
+                ts.hour, (ts.weekday() + 1) % 7, kit['cooldown'], kit['items'], ts, ts,
+            )
+        produced += count
+
+def seed_first_key(seen, key):
+    """True the first time a unique-constraint key is seen.
+
+    Reused DB ids make seeded servers/kits share keys; PostgreSQL never
+    treats keys containing NULL as duplicates, so those always pass.
+    """
+    if None in key:
+        return True
+    if key in seen:
+        return False
+    seen.add(key)
+    return True
+
+def gen_kit_hourly_stats(rng, world, cfg, limit):
+    produced = 0
+    now = world['end']
+    seen = set()  # (kit_config_id, game_server_id) - @@unique with hour/day of week
+    for s, server in enumerate(world['servers']):
+        for k, kit in enumerate(world['kits']):
+            if not seed_first_key(seen, (kit['config_id'], server['game_server_id'])):
+                continue
+            base = 4000.0 / ((s + 1) ** cfg['skew'] * (k + 1) ** cfg['skew'])
+            for day_of_week in range(7):
+                for hour in range(24):
+                    if produced >= limit:
+                        return
+                    total = int(base * SEED_HOUR_WEIGHTS[hour] * rng.uniform(0.7, 1.3))
+                    yield (seed_id(rng, 'kithourly'), hour, day_of_week, kit['config_id'],
+                           server['game_server_id'], total, now)
+                    produced += 1
+
+def gen_kit_daily_stats(rng, world, cfg, limit):
+    produced = 0
+    end = world['end']
+    seen = set()  # (date, kit_name, kit_config_id, game_server_id, wipe_id) - @@unique
+    for day in range(cfg['days']):
+        date = (end - timedelta(days=day)).replace(hour=0, minute=0, second=0, microsecond=0)
+        # Attribute each day to the wipe running at its end (a wipe day belongs to the new wipe)
+        day_end = min(end, date + timedelta(days=1, seconds=-1))
+        for s, server in enumerate(world['servers']):
+            rotation, wipe_id = seed_wipe_at(world, server, day_end)
+            for k, kit in enumerate(world['wipe_kits'][rotation]):
+                if produced >= limit:
+                    return
+                key = (date, kit['name'], kit['config_id'], server['game_server_id'], wipe_id)
+                if not seed_first_key(seen, key):
+                    continue
+                total = max(1, int(1500.0 / ((s + 1) ** cfg['skew'] * (k + 1) ** cfg['skew']) * rng.uniform(0.6, 1.4)))
+                failed = int(total * rng.uniform(0.0, 0.08))
+                chat = int(total * 0.7)
+                auto = int(total * 0.25)
+                yield (seed_id(rng, 'kitdaily'), date.strftime('%Y-%m-%d'), kit['name'], kit['config_id'],
+                       server['game_server_id'], wipe_id, total,
+                       max(1, int(total * rng.uniform(0.3, 0.8))), total - failed, failed,
+                       chat, auto, total - chat - auto, date, end)
+                produced += 1
+
+def gen_gambling_wins(rng, world, cfg, limit):
+    chunk = cfg['chunk']
+    produced = 0
+    while produced < limit:
+        count = min(chunk, limit - produced)
+        for server, player, ts, _ in seed_event_context(rng, world, cfg, count):
+            wager = rng.choice((10, 25, 50, 100, 250, 500, 1000, 5000))
+            yield (seed_id(rng, 'gamblewin'), seed_steam_id(player), seed_player_name(player),
+                   rng.choices(SEED_GAME_TYPES, weights=(50, 35, 15))[0], wager,
+                   wager * rng.choice((2, 2, 2, 3, 5)), server['ident'], ts)
+        produced += count
+
+def gen_redirect_logs(rng, world, cfg, limit):
+    chunk = cfg['chunk']
+    servers = world['servers']
+    produced = 0
+    while produced < limit:
+        count = min(chunk, limit - produced)
+        for server, player, ts, _ in seed_event_context(rng, world, cfg, count):
+            target = servers[rng.randrange(len(servers))]['ident']
+            if rng.random() < 0.05:
+                yield (seed_id(rng, 'redirlog'), 'wipe', None, None, None, None,
+                       rng.choice(('WIPE', 'WIPE_REDIRECT')), server['ident'], target,
+                       rng.randint(20, 300), 'success', None, ts, ts)
+            else:
+                reason = rng.choices(SEED_REDIRECT_REASONS, weights=(70, 20, 10))[0]
+                outcome = rng.choices(SEED_REDIRECT_OUTCOMES, weights=(90, 7, 3))[0]
+                yield (seed_id(rng, 'redirlog'), 'player', seed_player_name(player), seed_steam_id(player),
+                       rng.choice(SEED_RANKS), round(rng.uniform(300, 3600), 1) if reason == 'AFK_TIMEOUT' else None,
+                       reason, server['ident'], target, None, outcome,
+                       None if outcome == 'success' else 'Target server full', ts, ts)
+        produced += count
+
+def gen_clan_events(rng, world, cfg, limit):
+    chunk = cfg['chunk']
+    clan_count = max(1, cfg['players_per_server'] // 8)
+    produced = 0
+    while produced < limit:
+        count = min(chunk, limit - produced)
+        for server, player, ts, _ in seed_event_context(rng, world, cfg, count):
+            event_type = rng.choices(SEED_CLAN_EVENTS, weights=(5, 30, 25, 8, 12, 10, 2))[0]
+            clan = server['player_base'] + player % clan_count
+            target = None
+            if event_type in ('kick', 'promote', 'demote'):
+                target = seed_steam_id(server['player_base'] + rng.randrange(cfg['players_per_server']))
+            yield (seed_id(rng, 'clanevent'), uuid.UUID(int=rng.getrandbits(128)).hex, event_type,
+                   f"clan_seed_{clan}", seed_steam_id(player), target, server['ident'],
+                   json.dumps({'source': 'seed-scale'}), ts)
+        produced += count
+
+def stream_copy_rows(rows, out, cfg, table):
+    """Write rows to `out` in COPY text format, cfg['chunk'] rows at a time"""
+    written = 0
+    buffer = []
+    started = time.time()
+    for row in rows:
+        buffer.append('\t'.join(copy_value(v) for v in row))
+        if len(buffer) >= cfg['chunk']:
+            out.write('\n'.join(buffer) + '\n')
+            written += len(buffer)
+            buffer.clear()
+            if written % (cfg['chunk'] * 20) == 0:
+                rate = written / max(time.time() - started, 0.001)
+                log_print(f"    {table}: {written:,} rows ({rate:,.0f} rows/s)")
+    if buffer:
+        out.write('\n'.join(buffer) + '\n')
+        written += len(buffer)
+    return written
+
+def run_seed_scale(argv):
+    """Stream synthetic analytics rows into COPY files or a local database.
+
+    --seed-out=DIR writes <table>.copy files plus a load.sql for psql. Without
+    it rows are piped through a single psql session (one transaction for all
+    tables) against DATABASE_URL from .env.local, which must point at
+    localhost unless --seed-allow-remote=1.
+    """
+    cfg = parse_seed_args(argv)
+    tables = cfg['tables'] or list(SEED_TABLES)
+    unknown = [t for t in tables if t not in SEED_TABLES]
+    if unknown:
+        log_print(f"  {Colors.RED}[ERROR]{Colors.RESET} Unknown seed table(s): {', '.join(unknown)}")
+        log_print(f"  Available: {', '.join(SEED_TABLES)}")
+        return False
+
+    db_url = None
+    if not cfg['out']:
+        db_url = parse_database_url(PROJECT_DIR)
+        if not db_url:
+            log_print(f"  {Colors.RED}[ERROR]{Colors.RESET} No DATABASE_URL in .env.local (or pass --seed-out=DIR)")
+            return False
+        host = re.sub(r'^.*@', '', db_url.split('/')[2]).split(':')[0]
+        if host not in ('localhost', '127.0.0.1', '::1') and not cfg['allow_remote']:
+            log_print(f"  {Colors.RED}[ERROR]{Colors.RESET} Refusing to seed non-local database host '{host}'")
+            log_print(f"  Pass --seed-allow-remote=1 if this really is a scratch database")
+            return False
+        if not shutil.which('psql'):
+            log_print(f"  {Colors.RED}[ERROR]{Colors.RESET} psql not found on PATH (or pass --seed-out=DIR)")
+            return False
+        db_url = strip_prisma_params(db_url)
+    else:
+        os.makedirs(cfg['out'], exist_ok=True)
+
+    if not cfg['random_seed']:
+        cfg['random_seed'] = random.SystemRandom().randrange(1, 2 ** 31)
+
+    log_print(f"\n{Colors.CYAN}  Seeding {', '.join(tables)}{Colors.RESET}")
+    log_print(f"  Seed: {cfg['random_seed']} (repeat with --seed-random-seed={cfg['random_seed']})"
+              f"{' | truncating tables first' if cfg['truncate'] else ''}")
+    log_print(f"  Rows/table: {cfg['rows']:,} | Servers: {cfg['servers']} | Players/server: {cfg['players_per_server']:,} "
+              f"| Kits: {cfg['kits']} ({cfg['kits_per_wipe']}/wipe) | Wipes: {cfg['wipes']} | Days: {cfg['days']} | Skew: {cfg['skew']}")
+
+    world = build_seed_world(cfg, db_url)
+    header = ['\\set ON_ERROR_STOP on', 'BEGIN;']
+    if cfg['truncate']:
+        header.append(f"TRUNCATE {', '.join(tables)};")
+
+    if cfg['out']:
+        load_script = list(header)
+        for table in tables:
+            columns, generator = SEED_TABLES[table]
+            rows = generator(random.Random(f"{cfg['random_seed']}:{table}"), world, cfg, cfg['rows'])
+            path = os.path.join(cfg['out'], f"{table}.copy")
+            started = time.time()
+            with open(path, 'w', encoding='utf-8', newline='\n') as f:
+                written = stream_copy_rows(rows, f, cfg, table)
+            load_script.append(f"\\copy {table} ({seed_column_list(columns)}) FROM '{os.path.abspath(path)}'")
+            log_seed_table(table, written, started)
+        load_script.append('COMMIT;')
+        script_path = os.path.join(cfg['out'], 'load.sql')
+        with open(script_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write('\n'.join(load_script) + '\n')
+        log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} Load with: psql \"$DATABASE_URL\" -f {script_path}")
+        return True
+
+    # One psql session reads the whole script from stdin: every COPY runs in a
+    # single transaction, so a failure rolls back all tables
+    process = subprocess.Popen(
+        ['psql', db_url, '-q', '-f', '-'],
+        stdin=subprocess.PIPE, text=True, encoding='utf-8', env=get_psql_env(db_url)
+    )
+    try:
+        process.stdin.write('\n'.join(header) + '\n')
+        for table in tables:
+            columns, generator = SEED_TABLES[table]
+            rows = generator(random.Random(f"{cfg['random_seed']}:{table}"), world, cfg, cfg['rows'])
+            column_list = seed_column_list(columns)
+            target = table
+            if table in SEED_UPSERT_TABLES:
+                target = f"seed_stage_{table}"
+                process.stdin.write(f"CREATE TEMP TABLE {target} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP;\n")
+            process.stdin.write(f"COPY {target} ({column_list}) FROM STDIN;\n")
+            started = time.time()
+            written = stream_copy_rows(rows, process.stdin, cfg, table)
+            process.stdin.write('\\.\n')
+            if table in SEED_UPSERT_TABLES:
+                process.stdin.write(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {target} "
+                                    f"ON CONFLICT DO NOTHING;\n")
+            log_seed_table(table, written, started)
+        process.stdin.write('COMMIT;\n')
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+    if process.wait() != 0:
+        log_print(f"  {Colors.RED}[ERROR]{Colors.RESET} Seeding failed - transaction rolled back, no rows were kept")
+        return False
+
+    psql_query(db_url, 'ANALYZE ' + ', '.join(tables))
+    log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} Committed")
+    return True
+
+def seed_column_list(columns):
+    return ', '.join(f'"{c}"' for c in columns)
+
+def log_seed_table(table, written, started):
+    elapsed = max(time.time() - started, 0.001)
+    log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} {table}: {written:,} rows in {elapsed:.1f}s ({written / elapsed:,.0f} rows/s)")
+
+# Seed table definitions: table -> (COPY columns, row generator)
+SEED_TABLES = {
+    'kit_usage_event': ([
+        'id', 'event_id', 'kit_id', 'kit_name', 'kit_config_id', 'game_server_id', 'server_identifier',
+        'server_identifier_id', 'wipe_id', 'steam_id', 'player_name', 'auth_level', 'redemption_source',
+        'was_successful', 'failure_reason', 'hour_of_day', 'day_of_week', 'cooldown_seconds', 'item_count',
+        'redeemed_at', 'created_at',
+    ], gen_kit_usage_events),
+    'kit_usage_hourly_stats': ([
+        'id', 'hour_of_day', 'day_of_week', 'kit_config_id', 'game_server_id', 'total_redemptions', 'last_updated',
+    ], gen_kit_hourly_stats),
+    'kit_usage_daily_stats': ([
+        'id', 'date', 'kit_name', 'kit_config_id', 'game_server_id', 'wipe_id', 'total_redemptions',
+        'unique_players', 'successful_redemptions', 'failed_redemptions', 'chat_command_count',
+        'auto_kit_count', 'api_call_count', 'created_at', 'updated_at',
+    ], gen_kit_daily_stats),
+    'gambling_win_events': ([
+        'id', 'steam_id', 'player_name', 'game_type', 'wager', 'winnings', 'server_id', 'created_at',
+    ], gen_gambling_wins),
+    'redirect_log': ([
+        'id', 'log_type', 'player_name', 'steam_id', 'rank', 'afk_time_seconds', 'redirect_reason',
+        'source_identifier', 'target_identifier', 'players', 'outcome', 'failure_reason', 'timestamp', 'created_at',
+    ], gen_redirect_logs),
+    'clan_event': ([
+        'id', 'event_id', 'event_type', 'clan_id', 'actor_steam_id', 'target_steam_id', 'server_identifier',
+        'metadata', 'processed_at',
+    ], gen_clan_events),
+}
+
 def wait_for_server_ready(port, timeout=60):
     """Wait for the server to be ready"""
     start_time = time.time()
@@ -422,14 +1410,15 @@ def open_prisma_studio():
 
     log_print(f"  {Colors.CYAN}[INFO]{Colors.RESET} Starting Prisma Studio...")
     try:
+        studio_port = allocated_ports.get('studio', PRISMA_STUDIO_BASE_PORT)
         prisma_studio_process = subprocess.Popen(
-            [NPX_CMD, 'prisma', 'studio'],
+            [NPX_CMD, 'prisma', 'studio', '--port', str(studio_port)],
             cwd=PROJECT_DIR,
-            shell=True,
+            shell=USE_SHELL,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
         )
-        log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} Prisma Studio started (port 5555)")
+        log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} Prisma Studio started (port {studio_port})")
         return True
     except Exception as e:
         log_print(f"  {Colors.RED}[ERROR]{Colors.RESET} Failed to start Prisma Studio: {e}")
@@ -438,6 +1427,15 @@ def open_prisma_studio():
 def print_system_info(node_ver, npm_ver):
     """Print system information"""
     enabled_sites = [f"{s['name']} (:{s['port']})" for s in SITES.values() if s['enabled']]
+    total_mb, available_mb = get_memory_info()
+    memory_info = f"{total_mb} MB total, {available_mb} MB available" if total_mb else "unknown"
+    tuning_info = "\n              ".join(
+        f"{SITES[k]['name']}: heap {t['heap_mb']} MB"
+        + (f" (over {t['heap_budget_mb']} MB budget)" if 'heap_budget_mb' in t else "")
+        + f", threadpool {t['threadpool']}, "
+        + (f"workers {t['workers']}" if t['workers'] is not None else "workers not applied (next.config ignores NEXT_CPUS)")
+        for k, t in runtime_tuning.items()
+    ) or "none"
     log_print(f"""
 {Colors.CYAN}============================================
   System Information
@@ -446,7 +1444,10 @@ def print_system_info(node_ver, npm_ver):
   User:       {os.environ.get('USERNAME', os.environ.get('USER', 'unknown'))}
   Node:       {node_ver}
   NPM:        {npm_ver}
+  CPUs:       {os.cpu_count()}
+  Memory:     {memory_info}
   Sites:      {', '.join(enabled_sites)}
+  Tuning:     {tuning_info}
   Database:   From .env.local (DATABASE_URL)
 {Colors.CYAN}============================================{Colors.RESET}
 """)
@@ -485,6 +1486,15 @@ def keyboard_listener():
                     log_print(f"\n{Colors.CYAN}  Opening Prisma Studio...{Colors.RESET}\n")
                     open_prisma_studio()
                     continue
+                elif key == 't':
+                    print_compile_report()
+                    continue
+                elif key == 's':
+                    print_query_report()
+                    continue
+                elif key == 'l':
+                    show_logs(prompt_log_query())
+                    continue
                 elif key == 'd':
                     log_print(f"\n{Colors.BLUE}  Checking database connection...{Colors.RESET}\n")
                     if check_database_connection():
@@ -498,10 +1508,12 @@ def keyboard_listener():
                     return
                 elif key == '1':
                     SITES['kits']['enabled'] = not SITES['kits']['enabled']
+                    SITES['kits'].pop('shared', None)
                     status = "ENABLED" if SITES['kits']['enabled'] else "DISABLED"
                     log_print(f"\n{Colors.CYAN}  Icefuse Kit Manager: {status}{Colors.RESET}\n")
                 elif key == '2':
                     SITES['auth']['enabled'] = not SITES['auth']['enabled']
+                    SITES['auth'].pop('shared', None)
                     status = "ENABLED" if SITES['auth']['enabled'] else "DISABLED"
                     log_print(f"\n{Colors.MAGENTA}  Auth Server: {status}{Colors.RESET}\n")
             time.sleep(0.1)
@@ -527,12 +1539,518 @@ def keyboard_listener():
                     open_browser(f"http://localhost:{SITES['kits']['port']}")
                 elif key == 'p':
                     open_prisma_studio()
+                elif key == 't':
+                    print_compile_report()
+                elif key == 's':
+                    print_query_report()
+                elif key == 'l':
+                    show_logs(prompt_log_query())
                 elif key == 'd':
                     start_prisma_dev()
                 elif key == 'q':
                     quit_requested = True
                     return
 
+def parse_compile_line(line):
+    """Parse a Next.js 'Compiled /route in 2.3s (1200 modules)' line.
+
+    Returns (route, duration_ms, modules) or None. Route is None for HMR
+    recompiles ('Compiled in 345ms'), modules is None when not printed.
+    """
+    match = COMPILE_LINE_RE.search(re.sub(r'\033\[[0-9;]*m', '', line))
+    if not match:
+        return None
+    duration = float(match.group('duration'))
+    duration_ms = duration * {'ms': 1, 's': 1000, 'min': 60000}[match.group('unit')]
+    modules = int(match.group('modules')) if match.group('modules') else None
+    return match.group('route'), duration_ms, modules
+
+def find_changed_files(site_key, since, limit=None):
+    """Source files of a site modified after `since` (the likely HMR trigger).
+
+    Stops walking once more than `limit` files are found.
+    """
+    site_dir = SITES[site_key]['dir']
+    changed = []
+    for root_name in COMPILE_WATCH_DIRS:
+        for root, dirs, files in os.walk(os.path.join(site_dir, root_name)):
+            dirs[:] = [d for d in dirs if d not in ('node_modules', '.next') and not d.startswith('.next-')]
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) > since:
+                        changed.append(os.path.relpath(path, site_dir).replace(os.sep, '/'))
+                except OSError:
+                    pass
+                if limit is not None and len(changed) > limit:
+                    return changed
+    return changed
+
+def record_compile_event(site_key, line):
+    """Output handler: aggregate compile/recompile timings per site and route"""
+    parsed = parse_compile_line(line)
+    if not parsed:
+        return
+    route, duration_ms, modules = parsed
+    now = time.time()
+
+    with compile_lock:
+        since = compile_stats['last_event'].get(site_key, now - duration_ms / 1000 - 5)
+        compile_stats['last_event'][site_key] = now
+        stats = compile_stats['routes'].setdefault((site_key, route or '(hmr)'), {
+            'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0, 'modules': None,
+        })
+        stats['count'] += 1
+        stats['total_ms'] += duration_ms
+        stats['max_ms'] = max(stats['max_ms'], duration_ms)
+        stats['last_ms'] = duration_ms
+        if modules is not None:
+            stats['modules'] = modules
+
+        bucket = int((now - compile_stats['started']) // COMPILE_TREND_BUCKET_SECONDS)
+        trend = compile_stats['trend'].setdefault(bucket, {'count': 0, 'total_ms': 0.0})
+        trend['count'] += 1
+        trend['total_ms'] += duration_ms
+
+    if route is None:
+        # The source tree walk runs on the scanner thread - this one has to keep draining Next's output
+        start_compile_scanner()
+        try:
+            compile_scan_queue.put_nowait((site_key, since, duration_ms))
+        except queue.Full:
+            pass  # Scanner is behind (HMR storm) - these recompiles just go uncredited
+
+def start_compile_scanner():
+    """Start the changed-file scanner thread if it isn't running"""
+    global compile_scan_thread
+    with compile_lock:
+        if compile_scan_thread is None:
+            compile_scan_thread = threading.Thread(target=compile_scan_worker, daemon=True)
+            compile_scan_thread.start()
+
+def compile_scan_worker():
+    """Credit HMR recompiles to the source files changed since the previous compile.
+
+    Events that touch more than COMPILE_BULK_CHANGE_FILES files (git
+    checkout, codegen, formatters) aren't credited to any file.
+    """
+    while True:
+        site_key, since, duration_ms = compile_scan_queue.get()
+        changed = find_changed_files(site_key, since, COMPILE_BULK_CHANGE_FILES)
+        if len(changed) > COMPILE_BULK_CHANGE_FILES:
+            continue
+        with compile_lock:
+            for path in changed:
+                file_stats = compile_stats['files'].setdefault((site_key, path), {'count': 0, 'total_ms': 0.0})
+                file_stats['count'] += 1
+                file_stats['total_ms'] += duration_ms
+
+def print_compile_report(limit=10):
+    """Print slowest routes, most recompiled files and the compile-time trend"""
+    with compile_lock:
+        routes = sorted(compile_stats['routes'].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        files = sorted(compile_stats['files'].items(), key=lambda item: item[1]['count'], reverse=True)
+        trend = sorted(compile_stats['trend'].items())
+
+    if not routes:
+        log_print(f"  {Colors.YELLOW}[INFO]{Colors.RESET} No compile events recorded yet")
+        return
+
+    lines = [
+        f"\n{Colors.CYAN}============================================",
+        "  Compile Report",
+        f"============================================{Colors.RESET}",
+        f"  {Colors.BOLD}Slowest routes (by total compile time){Colors.RESET}",
+        f"    {'site':<6} {'route':<40} {'count':>5} {'avg':>8} {'max':>8} {'total':>9} {'modules':>8}",
+    ]
+    for (site_key, route), s in routes[:limit]:
+        lines.append(
+            f"    {site_key:<6} {route[:40]:<40} {s['count']:>5} {s['total_ms'] / s['count'] / 1000:>7.1f}s "
+            f"{s['max_ms'] / 1000:>7.1f}s {s['total_ms'] / 1000:>8.1f}s {s['modules'] or '-':>8}"
+        )
+
+    lines.append(f"\n  {Colors.BOLD}Most frequently recompiled files{Colors.RESET}")
+    if files:
+        for (site_key, path), s in files[:limit]:
+            lines.append(f"    {site_key:<6} {path[:60]:<60} {s['count']:>4}x  {s['total_ms'] / 1000:>7.1f}s")
+    else:
+        lines.append("    (no changed source files seen before an HMR recompile yet)")
+
+    lines.append(f"\n  {Colors.BOLD}Session trend (avg compile time per {COMPILE_TREND_BUCKET_SECONDS // 60} min){Colors.RESET}")
+    for bucket, s in trend:
+        start_min = bucket * COMPILE_TREND_BUCKET_SECONDS // 60
+        avg_s = s['total_ms'] / s['count'] / 1000
+        bar = '#' * min(40, max(1, int(avg_s * 4)))
+        lines.append(f"    +{start_min:>4}m {s['count']:>4} compiles {avg_s:>6.1f}s {bar}")
+    lines.append(f"{Colors.CYAN}============================================{Colors.RESET}")
+    log_print('\n'.join(lines))
+
+def load_table_models(site_key):
+    """Map database table names to Prisma model names from the site's schema.prisma"""
+    if site_key in query_table_models:
+        return query_table_models[site_key]
+    models = {}
+    schema_path = os.path.join(SITES[site_key]['dir'], 'prisma', 'schema.prisma')
+    try:
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            schema = f.read()
+        for match in re.finditer(r'^model (\w+) \{(.*?)^\}', schema, re.M | re.S):
+            table = re.search(r'@@map\("([^"]+)"\)', match.group(2))
+            models[table.group(1) if table else match.group(1)] = match.group(1)
+    except OSError:
+        pass
+    query_table_models[site_key] = models
+    return models
+
+def normalize_query(sql):
+    """Reduce a SQL statement to its shape and main table.
+
+    Parameters and literals become '?', IN lists and multi-row VALUES collapse,
+    schema qualifiers and SELECT column lists are dropped.
+    """
+    shape = re.sub(r'"\w+"\.(?="\w+"\."\w+")', '', sql)  # "public"."table"."col" -> "table"."col"
+    shape = re.sub(r'\b(FROM|INTO|UPDATE|JOIN) "\w+"\.(?="\w+")', r'\1 ', shape)  # FROM "public"."table"
+    shape = re.sub(r'\$\d+', '?', shape)
+    shape = re.sub(r"'(?:[^']|'')*'", '?', shape)
+    shape = re.sub(r'\b\d+(?:\.\d+)?\b', '?', shape)
+    shape = re.sub(r'\(\s*\?(?:\s*,\s*\?)+\s*\)', '(?+)', shape)
+    shape = re.sub(r'VALUES \(.*?\)(?:\s*,\s*\(.*?\))+', 'VALUES (...)', shape)
+    shape = re.sub(r'^SELECT (?!COUNT).*? FROM ', 'SELECT ... FROM ', shape)
+    shape = re.sub(r'\s+', ' ', shape).strip()
+    table = re.search(r'(?:FROM|INTO|UPDATE)\s+"(\w+)"', shape)
+    return shape, table.group(1) if table else None
+
+def add_query_sample(stats, duration_ms):
+    """Update count/total and a bounded reservoir of durations used for p95"""
+    stats['count'] += 1
+    stats['total_ms'] += duration_ms
+    samples = stats['samples']
+    if len(samples) < QUERY_SAMPLE_LIMIT:
+        samples.append(duration_ms)
+    else:
+        slot = random.randrange(stats['count'])
+        if slot < QUERY_SAMPLE_LIMIT:
+            samples[slot] = duration_ms
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def normalize_route(path):
+    """Collapse IDs in a request path so /api/kits/kit_<uuid> groups as /api/kits/:id"""
+    path = path.split('?', 1)[0]
+    path = re.sub(r'/[a-z]+_[0-9a-f-]{36}(?=/|$)', '/:id', path)
+    path = re.sub(r'/[0-9a-f-]{36}(?=/|$)', '/:id', path)
+    return re.sub(r'/\d+(?=/|$)', '/:n', path)
+
+def close_request_window(site_key, route):
+    """Attribute the queries seen since the last request to `route` and flag N+1 shapes"""
+    window = query_stats['windows'].pop(site_key, {})
+    for shape, count in window.items():
+        if count < QUERY_N_PLUS_ONE_THRESHOLD:
+            continue
+        entry = query_stats['n_plus_one'].setdefault((site_key, route, shape), {'hits': 0, 'max': 0})
+        entry['hits'] += 1
+        entry['max'] = max(entry['max'], count)
+
+def record_query_event(site_key, line):
+    """Output handler: aggregate '[prisma:query]' lines per query shape and model.
+
+    Next's 'GET /path 200 in 12ms' lines end a request window; queries seen since
+    the previous request are attributed to it. Query lines are not echoed.
+    """
+    if not query_log_mode:
+        return None
+    clean = re.sub(r'\033\[[0-9;]*m', '', line)
+
+    match = QUERY_LINE_RE.search(clean)
+    if match:
+        duration_ms = float(match.group('duration'))
+        shape, table = normalize_query(match.group('sql'))
+        if shape in ('BEGIN', 'COMMIT', 'ROLLBACK', 'SELECT ?'):
+            return True
+        model = load_table_models(site_key).get(table, table or '(raw)')
+        with query_lock:
+            for key, bucket in (((site_key, model, shape), 'shapes'), ((site_key, model), 'models')):
+                stats = query_stats[bucket].setdefault(key, {'count': 0, 'total_ms': 0.0, 'samples': []})
+                add_query_sample(stats, duration_ms)
+            window = query_stats['windows'].setdefault(site_key, {})
+            window[(model, shape)] = window.get((model, shape), 0) + 1
+        return True
+
+    match = REQUEST_LINE_RE.search(clean)
+    if match:
+        with query_lock:
+            close_request_window(site_key, f"{match.group('method')} {normalize_route(match.group('path'))}")
+    return None
+
+def site_supports_query_log(site_key):
+    """Whether the site's Prisma client prints '[prisma:query]' lines when PRISMA_QUERY_LOG=1.
+
+    Only sites whose src/lib/db.ts carries the createPrismaClient() change from
+    this repo do; ifn_app_auth_v2 needs the same change to show up in the report.
+    """
+    db_file = os.path.join(SITES[site_key]['dir'], QUERY_LOG_CLIENT_FILE)
+    try:
+        with open(db_file, 'r', encoding='utf-8') as f:
+            return 'PRISMA_QUERY_LOG' in f.read()
+    except OSError:
+        return False
+
+def query_log_coverage():
+    """Split enabled sites into (instrumented, not instrumented) names"""
+    covered, missing = [], []
+    for site_key, site in SITES.items():
+        if site['enabled']:
+            (covered if site_supports_query_log(site_key) else missing).append(site_key)
+    return covered, missing
+
+def format_query_report(limit=15):
+    """Build the slow-query report as a list of lines"""
+    with query_lock:
+        shapes = sorted(query_stats['shapes'].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        models = sorted(query_stats['models'].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        n_plus_one = sorted(query_stats['n_plus_one'].items(), key=lambda item: item[1]['max'], reverse=True)
+        shapes = [(k, dict(v, p95=percentile(v['samples'], 95))) for k, v in shapes[:limit]]
+        models = [(k, dict(v, p95=percentile(v['samples'], 95))) for k, v in models[:limit]]
+
+    lines = [
+        f"{Colors.CYAN}============================================",
+        f"  Prisma Query Report ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})",
+        f"============================================{Colors.RESET}",
+    ]
+    covered, missing = query_log_coverage()
+    lines.append(f"  Sites covered: {', '.join(covered) or 'none'}")
+    if missing:
+        lines.append(f"  {Colors.YELLOW}Not covered: {', '.join(missing)}{Colors.RESET} - their {QUERY_LOG_CLIENT_FILE} "
+                     f"does not read PRISMA_QUERY_LOG (port createPrismaClient() from this repo's {QUERY_LOG_CLIENT_FILE})")
+    lines += [
+        "",
+        f"  {Colors.BOLD}Models by total query time{Colors.RESET}",
+        f"    {'site':<6} {'model':<28} {'count':>7} {'total':>9} {'avg':>8} {'p95':>8}",
+    ]
+    for (site_key, model), s in models:
+        lines.append(f"    {site_key:<6} {model[:28]:<28} {s['count']:>7} {s['total_ms']:>7.0f}ms "
+                     f"{s['total_ms'] / s['count']:>6.1f}ms {s['p95']:>6.1f}ms")
+
+    lines.append(f"\n  {Colors.BOLD}Query shapes by total time{Colors.RESET}")
+    for (site_key, model, shape), s in shapes:
+        lines.append(f"    [{site_key}] {model}: {s['count']}x, total {s['total_ms']:.0f}ms, "
+                     f"avg {s['total_ms'] / s['count']:.1f}ms, p95 {s['p95']:.1f}ms")
+        lines.append(f"        {shape[:160]}")
+
+    lines.append(f"\n  {Colors.BOLD}Possible N+1 patterns (>= {QUERY_N_PLUS_ONE_THRESHOLD} identical queries in one request){Colors.RESET}")
+    if n_plus_one:
+        for (site_key, route, (model, shape)), s in n_plus_one[:limit]:
+            lines.append(f"    {Colors.YELLOW}[{site_key}] {route}{Colors.RESET}: {model} up to {s['max']}x per request "
+                         f"({s['hits']} request(s))")
+            lines.append(f"        {shape[:160]}")
+    else:
+        lines.append("    none detected")
+    lines.append(f"{Colors.CYAN}============================================{Colors.RESET}")
+    return lines
+
+def print_query_report():
+    """Print the slow-query report (needs --query-log)"""
+    if not query_log_mode:
+        log_print(f"  {Colors.YELLOW}[INFO]{Colors.RESET} Query logging is off - restart with --query-log")
+        return
+    log_print('\n' + '\n'.join(format_query_report()))
+
+def write_query_report():
+    """Write the slow-query report to QUERY_REPORT_FILE (called at shutdown)"""
+    if not query_log_mode or not query_stats['shapes']:
+        return
+    try:
+        with open(QUERY_REPORT_FILE, 'w', encoding='utf-8') as f:
+            for line in format_query_report(limit=50):
+                f.write(re.sub(r'\033\[[0-9;]*m', '', line) + '\n')
+        log(f"Query report written to {QUERY_REPORT_FILE}")
+    except OSError as e:
+        log(f"Could not write query report: {e}", "WARN")
+
+class LogRingBuffer:
+    """Fixed-capacity buffer of recent output lines.
+
+    Timestamps, levels and UTF-8 encoded lines live in preallocated slots that
+    are overwritten oldest-first, so memory stays flat however long the
+    session runs.
+    """
+    __slots__ = ('capacity', 'times', 'levels', 'lines', 'next', 'size', 'lock')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.levels = bytearray(capacity)
+        self.lines = [b''] * capacity
+        self.next = 0
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def append(self, timestamp, level, text):
+        data = text.encode('utf-8', 'replace')[:LOG_LINE_MAX_BYTES]
+        with self.lock:
+            i = self.next
+            self.times[i] = timestamp
+            self.levels[i] = level
+            self.lines[i] = data
+            self.next = (i + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+    def entries(self):
+        """Snapshot of (timestamp, level, bytes) from oldest to newest"""
+        with self.lock:
+            start = (self.next - self.size) % self.capacity
+            slots = [(start + k) % self.capacity for k in range(self.size)]
+            return [(self.times[i], self.levels[i], self.lines[i]) for i in slots]
+
+def detect_log_level(text):
+    """Guess a line's severity from Next/npm/Prisma markers"""
+    if LOG_ERROR_RE.search(text):
+        return LOG_LEVELS['ERROR']
+    if LOG_WARN_RE.search(text):
+        return LOG_LEVELS['WARN']
+    return LOG_LEVELS['INFO']
+
+def buffer_log_line(source, text, level=None, timestamp=None):
+    """Store a line in the ring buffer of `source` (a site key or 'launcher')"""
+    buffer = log_buffers.get(source)
+    if buffer is None:
+        buffer = log_buffers.setdefault(source, LogRingBuffer(LOG_BUFFER_LINES))
+    text = re.sub(r'\033\[[0-9;]*m', '', text)
+    if level is None:
+        level = detect_log_level(text)
+    buffer.append(timestamp or time.time(), level, text)
+
+def record_log_line(site_key, line):
+    """Output handler: keep site output in the site's ring buffer"""
+    if query_log_mode and QUERY_LINE_RE.search(line):
+        return None  # Aggregated by record_query_event, would flush everything else out
+    if line.strip():
+        buffer_log_line(site_key, line)
+    return None
+
+def parse_log_query(query):
+    """Parse 'site=kits level=warn last=100 crash window=30 <regex>' into filter options"""
+    options = {'sites': None, 'min_level': 0, 'pattern': None, 'limit': LOG_TAIL_LINES,
+               'since': None, 'until': None}
+    words = []
+    for token in query.split():
+        key, _, value = token.partition('=')
+        key = key.lower()
+        if key == 'site' and value:
+            options['sites'] = value.split(',')
+        elif key == 'level' and value.upper() in LOG_LEVELS:
+            options['min_level'] = LOG_LEVELS[value.upper()]
+        elif key == 'last' and value.isdigit():
+            options['limit'] = int(value)
+        elif key == 'window' and value.isdigit():
+            options['window'] = int(value)
+        elif token.lower() == 'crash':
+            options['crash'] = True
+        else:
+            words.append(token)
+    if words:
+        try:
+            options['pattern'] = re.compile(' '.join(words), re.I)
+        except re.error as e:
+            log_print(f"  {Colors.YELLOW}[WARN]{Colors.RESET} Invalid regex ({e}), matching literally")
+            options['pattern'] = re.compile(re.escape(' '.join(words)), re.I)
+    if options.pop('crash', False):
+        if not last_crash:
+            log_print(f"  {Colors.YELLOW}[INFO]{Colors.RESET} No crash recorded this session")
+            return None
+        window = options.pop('window', LOG_CRASH_WINDOW_SECONDS)
+        options['since'] = last_crash['time'] - window
+        options['until'] = last_crash['time'] + 5
+        options['limit'] = max(options['limit'], LOG_BUFFER_LINES)
+    options.pop('window', None)
+    return options
+
+def search_log_buffers(sites=None, min_level=0, pattern=None, since=None, until=None, limit=LOG_TAIL_LINES):
+    """Return matching (timestamp, source, level, text) entries, oldest first, newest `limit` kept"""
+    results = []
+    for source, buffer in list(log_buffers.items()):
+        if sites and source not in sites:
+            continue
+        for timestamp, level, data in buffer.entries():
+            if level < min_level or (since and timestamp < since) or (until and timestamp > until):
+                continue
+            text = data.decode('utf-8', 'replace')
+            if pattern and not pattern.search(text):
+                continue
+            results.append((timestamp, source, level, text))
+    results.sort(key=lambda entry: entry[0])
+    return results[-limit:] if limit else results
+
+def print_log_entries(entries, title):
+    """Print buffered log entries with time, source and level"""
+    level_names = {v: k for k, v in LOG_LEVELS.items()}
+    level_colors = {LOG_LEVELS['ERROR']: Colors.RED, LOG_LEVELS['WARN']: Colors.YELLOW}
+    lines = [f"\n{Colors.CYAN}  ---- {title} ({len(entries)} lines) ----{Colors.RESET}"]
+    for timestamp, source, level, text in entries:
+        stamp = datetime.fromtimestamp(timestamp).strftime('%H:%M:%S.%f')[:-3]
+        color = SITES[source]['color'] if source in SITES else Colors.BLUE
+        level_color = level_colors.get(level, '')
+        lines.append(f"  {stamp} {color}{source:<8}{Colors.RESET} {level_color}{level_names[level]:<5}{Colors.RESET} {text}")
+    lines.append(f"{Colors.CYAN}  ---- end ----{Colors.RESET}")
+    log_print('\n'.join(lines), also_log=False)
+
+def show_logs(query=None):
+    """Filter the ring buffers with a query (defaults to --log-filter) and print the result"""
+    query = log_filter if query is None or not query.strip() else query
+    options = parse_log_query(query)
+    if options is None:
+        return
+    print_log_entries(search_log_buffers(**options), f"Logs: {query or 'tail'}")
+
+def prompt_log_query():
+    """Ask for a log query after [L] is pressed"""
+    prompt = "  Log filter (regex, site=kits, level=warn|error, last=N, crash [window=S]): "
+    try:
+        if sys.platform == "win32":
+            return input(prompt)
+        # Line-buffered terminal: text typed after the 'l' on the same line ('l error<Enter>')
+        # is already waiting; otherwise the query is read from the next line
+        rest = sys.stdin.readline().strip()
+        if rest:
+            return rest
+        print(prompt, end='', flush=True)
+        return sys.stdin.readline()
+    except (EOFError, KeyboardInterrupt):
+        return ''
+
+def report_crash(site_key):
+    """Remember when a site died and print the tail of its output"""
+    last_crash.clear()
+    last_crash.update({'site': site_key, 'time': time.time()})
+    thread = site_output_threads.pop(site_key, None)
+    if thread:
+        thread.join(timeout=2)  # Let the reader drain the final lines
+    options = parse_log_query(log_filter) or {}
+    options['sites'] = [site_key]
+    options['limit'] = LOG_TAIL_LINES
+    print_log_entries(search_log_buffers(**options), f"Last output of {SITES[site_key]['name']}")
+
+def pump_site_output(site_key, process):
+    """Forward a site server's output to the console and run it through SITE_OUTPUT_HANDLERS"""
+    for line in process.stdout:
+        line = line.rstrip('\r\n')
+        suppress = False
+        for handler in SITE_OUTPUT_HANDLERS:
+            try:
+                suppress = handler(site_key, line) is True or suppress
+            except Exception as e:
+                log(f"Output handler {handler.__name__} failed: {e}", "WARN", console=False)
+        if not suppress:
+            safe_print(line)
+
+# Stages every line of site server output passes through: handler(site_key, line).
+# A handler returning True keeps the line off the console.
+SITE_OUTPUT_HANDLERS = [record_log_line, record_compile_event, record_query_event]
+
 def run_site_server(site_key, site_config):
     """Run a single site's development server"""
     global site_processes
@@ -543,22 +2061,50 @@ def run_site_server(site_key, site_config):
 
     log(f"Starting {site_name} on port {port}...")
 
-    env = get_site_env()
+    env = get_site_env(site_key)
     env['PORT'] = str(port)
+    env['NEXT_DIST_DIR'] = get_site_dist_dir(site_key)
+    env['FORCE_COLOR'] = '1'  # Output is piped through the launcher - keep Next's colors
+    for var, linked_key in site_config.get('links', {}).items():
+        if SITES[linked_key]['enabled'] or SITES[linked_key].get('shared'):
+            url = get_site_url(linked_key)
+            if url:
+                env[var] = url
 
     try:
+        # Pass the port explicitly: it overrides the -p hard-coded in the dev script
         process = subprocess.Popen(
-            [NPM_CMD, 'run', 'dev'],
+            [NPM_CMD, 'run', 'dev', '--', '--port', str(port)],
             cwd=site_dir,
             env=env,
-            shell=True
+            shell=USE_SHELL,
+            start_new_session=not USE_SHELL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1
         )
         site_processes[site_key] = process
+        reader = threading.Thread(target=pump_site_output, args=(site_key, process), daemon=True)
+        reader.start()
+        site_output_threads[site_key] = reader
         return process
     except Exception as e:
         log(f"Failed to start {site_name}: {e}", "ERROR")
         return None
 
+def stop_process(process):
+    """Terminate a site server together with the node processes it spawned"""
+    try:
+        if USE_SHELL:
+            process.terminate()
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+    except:
+        pass
+
 def run_all_servers():
     """Run all enabled development servers"""
     global reboot_requested, quit_requested, site_processes
@@ -586,6 +2132,9 @@ def run_all_servers():
     [O] Open    - Open browser
     [P] Prisma  - Open Prisma Studio
     [D] Database - Check database connection
+    [T] Timings - Compile report
+    [S] SQL     - Slow-query report
+    [L] Logs    - Search recent output
     [Q] Quit    - Stop servers and exit
 ============================================{Colors.RESET}
 """)
@@ -605,6 +2154,7 @@ def run_all_servers():
                 if process and process.poll() is not None:
                     log(f"{SITES[site_key]['name']} process died", "WARN")
                     del site_processes[site_key]
+                    report_crash(site_key)
 
             if not site_processes:
                 log("All processes died", "WARN")
@@ -625,10 +2175,7 @@ def run_all_servers():
     finally:
         for site_key, process in site_processes.items():
             if process:
-                try:
-                    process.terminate()
-                except:
-                    pass
+                stop_process(process)
 
         if prisma_studio_process:
             try:
@@ -636,10 +2183,11 @@ def run_all_servers():
             except:
                 pass
 
-        for site_config in SITES.values():
+        # Only free ports this instance allocated - other launchers keep theirs
+        for site_config in enabled_sites.values():
             kill_port(site_config['port'])
 
-        if sys.platform == "win32":
+        if sys.platform == "win32" and not count_other_instances():
             subprocess.run('taskkill /F /IM node.exe', shell=True, capture_output=True)
 
         site_processes.clear()
@@ -664,7 +2212,7 @@ def setup_site(site_key, site_config, step_offset, skip_checks=False):
 
     # Clean caches
     log_print(f"  [{step_offset}/X] Cleaning caches for {site_name}...")
-    clean_next_cache(site_dir, site_name)
+    clean_next_cache(site_key, site_dir, site_name)
     clean_prisma_client(site_dir, site_name)
 
     # Check dependencies
@@ -693,15 +2241,24 @@ def startup_sequence(skip_node_check=False):
     quit_requested = False
 
     clear_console()
+
+    # Kill stray node processes and allocate ports first so the header shows the real ports
+    kill_all_node_processes()
+    apply_shared_sites()
+    try:
+        allocate_ports()
+    except RuntimeError as e:
+        log_print(f"  {Colors.RED}[ERROR]{Colors.RESET} {e}")
+        return False
+
     print_header()
 
     enabled_sites = {k: v for k, v in SITES.items() if v['enabled']}
 
-    # Step 0: Kill all node processes and clear ports
-    log_print(f"  [0] Stopping all running sites...")
-    kill_all_node_processes()
-    for site_config in SITES.values():
-        kill_port(site_config['port'])
+    # Step 0: Report stopped sites and allocated ports
+    log_print(f"  [0] Stopped running sites, allocated ports:")
+    for site_config in enabled_sites.values():
+        log_print(f"  {Colors.GREEN}[OK]{Colors.RESET} {site_config['name']} -> port {site_config['port']}")
 
     # Step 1: Check Node.js
     if not skip_node_check:
@@ -711,8 +2268,8 @@ def startup_sequence(skip_node_check=False):
             return False
     else:
         log_print(f"\n  [1] Skipping Node.js check (reboot)...")
-        node_ver = subprocess.run([NODE_EXE, '-v'], capture_output=True, text=True, shell=True).stdout.strip()
-        npm_ver = subprocess.run([NPM_CMD, '-v'], capture_output=True, text=True, shell=True).stdout.strip()
+        node_ver = subprocess.run([NODE_EXE, '-v'], capture_output=True, text=True, shell=USE_SHELL).stdout.strip()
+        npm_ver = subprocess.run([NPM_CMD, '-v'], capture_output=True, text=True, shell=USE_SHELL).stdout.strip()
 
     # Step 2: Check database connection (if not quick mode)
     if not quick_mode:
@@ -722,6 +2279,9 @@ def startup_sequence(skip_node_check=False):
         else:
             log_print(f"  {Colors.YELLOW}[WARN]{Colors.RESET} Cannot reach database (check DATABASE_URL in .env.local)")
 
+    # Size Node runtime settings for the enabled sites
+    compute_runtime_tuning()
+
     # Setup each enabled site
     step = 3
     for site_key, site_config in enabled_sites.items():
@@ -740,20 +2300,52 @@ def cleanup():
             prisma_studio_process.terminate()
         except:
             pass
+    write_query_report()
+    release_ports()
 
 def main():
-    global reboot_requested, quit_requested, quick_mode
+    global reboot_requested, quit_requested, quick_mode, query_log_mode, log_filter
+    global LOG_FILE, QUERY_REPORT_FILE, LOG_BUFFER_LINES
+
+    if '--seed-scale' in sys.argv:
+        sys.exit(0 if run_seed_scale(sys.argv[1:]) else 1)
+
+    # Secondary instances log to their own file so they don't clobber the primary's log
+    try:
+        register_instance()
+    except RuntimeError as e:
+        log_print(f"{Colors.RED}  [ERROR] {e}{Colors.RESET}")
+        sys.exit(1)
+    if instance_slot > 0:
+        LOG_FILE = os.path.join(PROJECT_DIR, f"dev_server.{instance_slot}.log")
+        QUERY_REPORT_FILE = os.path.join(PROJECT_DIR, f"query_report.{instance_slot}.txt")
 
     if '--quick' in sys.argv or '-q' in sys.argv:
         quick_mode = True
         log_print(f"{Colors.GREEN}  Quick mode enabled - skipping Prisma steps{Colors.RESET}")
 
+    parse_tune_args(sys.argv[1:])
+
+    for arg in sys.argv[1:]:
+        if arg.startswith('--log-filter='):
+            log_filter = arg[len('--log-filter='):]
+        elif arg.startswith('--log-buffer=') and arg[len('--log-buffer='):].isdigit():
+            LOG_BUFFER_LINES = max(100, int(arg[len('--log-buffer='):]))
+
     auth_dir = SITES['auth']['dir']
     if not os.path.exists(auth_dir):
         log_print(f"{Colors.YELLOW}  [WARN] Auth server directory not found: {auth_dir}")
         log_print(f"  Disabling auth server...{Colors.RESET}")
         SITES['auth']['enabled'] = False
 
+    if '--query-log' in sys.argv:
+        query_log_mode = True
+        log_print(f"{Colors.GREEN}  Query logging enabled - Prisma queries are aggregated, press [S] for the report{Colors.RESET}")
+        covered, missing = query_log_coverage()
+        if missing:
+            log_print(f"{Colors.YELLOW}  [WARN] No query logging for: {', '.join(missing)} "
+                      f"({QUERY_LOG_CLIENT_FILE} there does not read PRISMA_QUERY_LOG){Colors.RESET}")
+
     if os.path.exists(LOG_FILE):
         os.remove(LOG_FILE)
     with open(LOG_FILE, "w", encoding="utf-8") as f:
@@ -7,6 +7,9 @@ const nextConfig: NextConfig = {
   // Enable standalone output for Docker deployment (production only)
   output: isDev ? undefined : 'standalone',
 
+  // Per-instance build dir so parallel dev_server.py launchers don't share .next
+  distDir: process.env.NEXT_DIST_DIR || '.next',
+
   // Development performance optimizations
   reactStrictMode: !isDev, // Disable double-render in dev for faster hot reloads
 
@@ -14,6 +17,8 @@ const nextConfig: NextConfig = {
   experimental: {
     // Faster module resolution
     optimizePackageImports: ['lucide-react', '@dnd-kit/core', '@dnd-kit/sortable'],
+    // Worker count sized per machine by dev_server.py
+    ...(process.env.NEXT_CPUS ? { cpus: Number(process.env.NEXT_CPUS) } : {}),
   },
 
   images: {
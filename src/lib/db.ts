@@ -11,11 +11,29 @@ import { PrismaClient } from '@prisma/client'
 
 const globalForPrisma = globalThis as unknown as { prisma?: PrismaClient }
 
-export const prisma =
-  globalForPrisma.prisma ??
-  new PrismaClient({
-    log: process.env.NODE_ENV === 'development' ? ['error', 'warn'] : ['error'],
+/**
+ * Create the Prisma client
+ * With PRISMA_QUERY_LOG=1 (set by dev_server.py --query-log) every query is
+ * printed as a single "[prisma:query] <ms>ms <sql>" line for the launcher's
+ * slow-query report.
+ */
+function createPrismaClient(): PrismaClient {
+  if (process.env.PRISMA_QUERY_LOG !== '1') {
+    return new PrismaClient({
+      log: process.env.NODE_ENV === 'development' ? ['error', 'warn'] : ['error'],
+    })
+  }
+
+  const client = new PrismaClient({
+    log: [{ emit: 'event', level: 'query' }, 'error', 'warn'],
   })
+  client.$on('query', (e) => {
+    console.log(`[prisma:query] ${e.duration}ms ${e.query.replace(/\s+/g, ' ')}`)
+  })
+  return client
+}
+
+export const prisma = globalForPrisma.prisma ?? createPrismaClient()
 
 if (process.env.NODE_ENV !== 'production') {
   globalForPrisma.prisma = prisma